@@ -1,7 +1,9 @@
+import asyncio
 import contextlib
 import logging
 import os
 import json
+import textwrap
 from collections.abc import AsyncIterator
 from typing import List
 
@@ -11,17 +13,16 @@ from mcp.server.lowlevel import Server
 from mcp.server.sse import SseServerTransport
 from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
 from starlette.applications import Starlette
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.responses import Response
 from starlette.routing import Mount, Route
 from starlette.types import Receive, Scope, Send
 from dotenv import load_dotenv
 
+import tools
 from tools import (
 auth_token_context,
-brave_web_search,
-brave_video_search,
-brave_news_search,
-brave_image_search
+close_brave_http
 )
 
 
@@ -31,7 +32,212 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# Tool results are consumed by LLM clients, so emit compact JSON; indentation
+# only inflates the payload.
+try:
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
 BRAVE_SEARCH_MCP_SERVER_PORT = int(os.getenv("BRAVE_SEARCH_MCP_SERVER_PORT", "5000"))
+MCP_REQUEST_TIMEOUT = int(os.getenv("MCP_REQUEST_TIMEOUT", "60"))
+MCP_MAX_INFLIGHT = int(os.getenv("MCP_MAX_INFLIGHT", "32"))
+
+# Caps concurrent tool calls across all sessions so bursts queue here instead
+# of fanning out to the Brave API.
+_CALL_SEM = asyncio.Semaphore(MCP_MAX_INFLIGHT)
+
+# Tool definitions are static, so build them once at import time instead of
+# on every list_tools request.
+_TOOLS_LIST = [
+    types.Tool(
+        name="brave_web_search",
+        description=textwrap.dedent("""
+        Perform a Brave web search.
+
+        Typical use: get live web results by query, with optional pagination, country, language, and safesearch filters.
+        """).strip(),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Required. The search query. Max 400 chars & 50 words."
+                },
+                "count": {
+                    "type": "integer",
+                    "description": "Number of results to return (max 20, default 5)."
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Zero-based offset for pagination."
+                },
+                "country": {
+                    "type": "string",
+                    "description": "2-letter country code to localize results, e.g., 'US'."
+                },
+                "search_lang": {
+                    "type": "string",
+                    "description": "Language code for search results, e.g., 'en'."
+                },
+                "safesearch": {
+                    "type": "string",
+                    "enum": ["off", "moderate", "strict"],
+                    "description": "Filter adult content."
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+
+    types.Tool(
+        name="brave_image_search",
+        description=textwrap.dedent("""
+        Perform a Brave image search by query.
+
+        Supports safesearch filtering, language and country localization, and pagination.
+        """).strip(),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "[Required] Search term for images. Max 400 chars & 50 words."
+                },
+                "count": {
+                    "type": "integer",
+                    "description": "Number of image results to return (default: 5, max: 200)."
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Zero-based offset for pagination."
+                },
+                "search_lang": {
+                    "type": "string",
+                    "description": "Language code for image results, e.g., 'en'."
+                },
+                "country": {
+                    "type": "string",
+                    "description": "2-letter country code to localize results, e.g., 'US'."
+                },
+                "safesearch": {
+                    "type": "string",
+                    "enum": ["off", "strict"],
+                    "description": "Adult content filter: 'off' or 'strict'."
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    types.Tool(
+        name="brave_news_search",
+        description=textwrap.dedent("""
+        Perform a Brave news search by query.
+
+        Supports safesearch filtering, language and country localization, pagination, and freshness filter to get recent news.
+        """).strip(),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "[Required] Search term for news articles. Max 400 chars & 50 words."
+                },
+                "count": {
+                    "type": "integer",
+                    "description": "Number of news results to return (default: 5, max: 50)."
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Zero-based offset for pagination."
+                },
+                "country": {
+                    "type": "string",
+                    "description": "2-letter country code to localize results, e.g., 'US'."
+                },
+                "search_lang": {
+                    "type": "string",
+                    "description": "Language code for news results, e.g., 'en'."
+                },
+                "safesearch": {
+                    "type": "string",
+                    "enum": ["off", "moderate", "strict"],
+                    "description": "Adult content filter: 'off', 'moderate', or 'strict'."
+                },
+                "freshness": {
+                    "type": "string",
+                    "description": "Filter by recency: 'pd' (24h), 'pw' (7d), 'pm' (31d), 'py' (year), or custom 'YYYY-MM-DDtoYYYY-MM-DD'."
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    types.Tool(
+        name="brave_video_search",
+        description=textwrap.dedent("""
+        Perform a Brave video search by query.
+        Supports safesearch filtering, language and country localization, pagination, and freshness filter to get recent videos.
+        """).strip(),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "[Required] Search term for videos. Max 400 chars & 50 words."
+                },
+                "count": {
+                    "type": "integer",
+                    "description": "Number of video results to return (default: 5, max: 50)."
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Zero-based offset for pagination."
+                },
+                "country": {
+                    "type": "string",
+                    "description": "2-letter country code to localize results, e.g., 'US'."
+                },
+                "search_lang": {
+                    "type": "string",
+                    "description": "Language code for video results, e.g., 'en'."
+                },
+                "safesearch": {
+                    "type": "string",
+                    "enum": ["off", "moderate", "strict"],
+                    "description": "Adult content filter: 'off', 'moderate', or 'strict'."
+                },
+                "freshness": {
+                    "type": "string",
+                    "description": "Filter by discovery date: 'pd' (24h), 'pw' (7d), 'pm' (31d), 'py' (year), or custom 'YYYY-MM-DDtoYYYY-MM-DD'."
+                }
+            },
+            "required": ["query"]
+        }
+    )
+]
+
+# Optional arguments forwarded to each tool; anything not supplied falls back
+# to the tool function's own default.
+_WEB_SEARCH_KEYS = ("count", "offset", "country", "search_lang", "safesearch")
+_IMAGE_SEARCH_KEYS = ("count", "offset", "search_lang", "country", "safesearch")
+_NEWS_SEARCH_KEYS = ("count", "offset", "country", "search_lang", "safesearch", "freshness")
+_VIDEO_SEARCH_KEYS = ("count", "offset", "country", "search_lang", "safesearch", "freshness")
+
+_TOOL_KEYS = {
+    "brave_web_search": _WEB_SEARCH_KEYS,
+    "brave_image_search": _IMAGE_SEARCH_KEYS,
+    "brave_news_search": _NEWS_SEARCH_KEYS,
+    "brave_video_search": _VIDEO_SEARCH_KEYS,
+}
+
+
+def _err(message: str) -> list[types.TextContent]:
+    return [types.TextContent(type="text", text=f"Error: {message}")]
+
 
 @click.command()
 @click.option("--port", default=BRAVE_SEARCH_MCP_SERVER_PORT, help="Port to listen on for HTTP")
@@ -46,11 +252,23 @@ BRAVE_SEARCH_MCP_SERVER_PORT = int(os.getenv("BRAVE_SEARCH_MCP_SERVER_PORT", "50
     default=False,
     help="Enable JSON responses for StreamableHTTP instead of SSE streams",
 )
+@click.option(
+    "--ssl-keyfile",
+    default=None,
+    help="TLS private key file; serve HTTPS when set together with --ssl-certfile",
+)
+@click.option(
+    "--ssl-certfile",
+    default=None,
+    help="TLS certificate file; serve HTTPS when set together with --ssl-keyfile",
+)
 
 def main(
     port: int,
     log_level: str,
     json_response: bool,
+    ssl_keyfile: str | None,
+    ssl_certfile: str | None,
 ) -> int:
     # Configure logging
     logging.basicConfig(
@@ -63,250 +281,53 @@ def main(
 #-------------------------------------------------------------------
     @app.list_tools()
     async def list_tools() -> list[types.Tool]:
-        return [
-            types.Tool(
-                name="brave_web_search",
-                description="""
-                Perform a Brave web search.
-
-                Typical use: get live web results by query, with optional pagination, country, language, and safesearch filters.
-                """,
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "Required. The search query. Max 400 chars & 50 words."
-                        },
-                        "count": {
-                            "type": "integer",
-                            "description": "Number of results to return (max 20, default 5)."
-                        },
-                        "offset": {
-                            "type": "integer",
-                            "description": "Zero-based offset for pagination."
-                        },
-                        "country": {
-                            "type": "string",
-                            "description": "2-letter country code to localize results, e.g., 'US'."
-                        },
-                        "search_lang": {
-                            "type": "string",
-                            "description": "Language code for search results, e.g., 'en'."
-                        },
-                        "safesearch": {
-                            "type": "string",
-                            "enum": ["off", "moderate", "strict"],
-                            "description": "Filter adult content."
-                        }
-                    },
-                    "required": ["query"]
-                }
-            ),
-
-            types.Tool(
-                name="brave_image_search",
-                description="""
-                Perform a Brave image search by query.
-
-                Supports safesearch filtering, language and country localization, and pagination.
-                """,
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "[Required] Search term for images. Max 400 chars & 50 words."
-                        },
-                        "count": {
-                            "type": "integer",
-                            "description": "Number of image results to return (default: 5, max: 200)."
-                        },
-                        "offset": {
-                            "type": "integer",
-                            "description": "Zero-based offset for pagination."
-                        },
-                        "search_lang": {
-                            "type": "string",
-                            "description": "Language code for image results, e.g., 'en'."
-                        },
-                        "country": {
-                            "type": "string",
-                            "description": "2-letter country code to localize results, e.g., 'US'."
-                        },
-                        "safesearch": {
-                            "type": "string",
-                            "enum": ["off", "strict"],
-                            "description": "Adult content filter: 'off' or 'strict'."
-                        }
-                    },
-                    "required": ["query"]
-                }
-            ),
-            types.Tool(
-                name="brave_news_search",
-                description="""
-                Perform a Brave news search by query.
-
-                Supports safesearch filtering, language and country localization, pagination, and freshness filter to get recent news.
-                """,
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "[Required] Search term for news articles. Max 400 chars & 50 words."
-                        },
-                        "count": {
-                            "type": "integer",
-                            "description": "Number of news results to return (default: 5, max: 50)."
-                        },
-                        "offset": {
-                            "type": "integer",
-                            "description": "Zero-based offset for pagination."
-                        },
-                        "country": {
-                            "type": "string",
-                            "description": "2-letter country code to localize results, e.g., 'US'."
-                        },
-                        "search_lang": {
-                            "type": "string",
-                            "description": "Language code for news results, e.g., 'en'."
-                        },
-                        "safesearch": {
-                            "type": "string",
-                            "enum": ["off", "moderate", "strict"],
-                            "description": "Adult content filter: 'off', 'moderate', or 'strict'."
-                        },
-                        "freshness": {
-                            "type": "string",
-                            "description": "Filter by recency: 'pd' (24h), 'pw' (7d), 'pm' (31d), 'py' (year), or custom 'YYYY-MM-DDtoYYYY-MM-DD'."
-                        }
-                    },
-                    "required": ["query"]
-                }
-            ),
-            types.Tool(
-                name="brave_video_search",
-                description="""
-                Perform a Brave video search by query.
-                Supports safesearch filtering, language and country localization, pagination, and freshness filter to get recent videos.
-                """,
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "[Required] Search term for videos. Max 400 chars & 50 words."
-                        },
-                        "count": {
-                            "type": "integer",
-                            "description": "Number of video results to return (default: 5, max: 50)."
-                        },
-                        "offset": {
-                            "type": "integer",
-                            "description": "Zero-based offset for pagination."
-                        },
-                        "country": {
-                            "type": "string",
-                            "description": "2-letter country code to localize results, e.g., 'US'."
-                        },
-                        "search_lang": {
-                            "type": "string",
-                            "description": "Language code for video results, e.g., 'en'."
-                        },
-                        "safesearch": {
-                            "type": "string",
-                            "enum": ["off", "moderate", "strict"],
-                            "description": "Adult content filter: 'off', 'moderate', or 'strict'."
-                        },
-                        "freshness": {
-                            "type": "string",
-                            "description": "Filter by discovery date: 'pd' (24h), 'pw' (7d), 'pm' (31d), 'py' (year), or custom 'YYYY-MM-DDtoYYYY-MM-DD'."
-                        }
-                    },
-                    "required": ["query"]
-                }
-            )
-
-        ]
+        return _TOOLS_LIST
 
     @app.call_tool()
     async def call_tool(
             name: str,
             arguments: dict
     ) -> List[types.TextContent | types.ImageContent | types.EmbeddedResource]:
-        if name == "brave_web_search":
-            try:
-                result = brave_web_search(
-                    query=arguments["query"],
-                    count=arguments.get("count"),
-                    offset=arguments.get("offset"),
-                    country=arguments.get("country"),
-                    search_lang=arguments.get("search_lang"),
-                    safesearch=arguments.get("safesearch")
-                )
-                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-            except Exception as e:
-                logger.exception(f"Error in brave_search: {e}")
-                return [types.TextContent(type="text", text=f"Error: {str(e)}")]
-
-        elif name == "brave_image_search":
-            try:
-                result = brave_image_search(
-                    query=arguments["query"],
-                    count=arguments.get("count"),
-                    offset=arguments.get("offset"),
-                    search_lang=arguments.get("search_lang"),
-                    country=arguments.get("country"),
-                    safesearch=arguments.get("safesearch")
-                )
-                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-            except Exception as e:
-                logger.exception(f"Error in brave_image_search: {e}")
-                return [types.TextContent(type="text", text=f"Error: {str(e)}")]
-
-        elif name == "brave_news_search":
-            try:
-                result = brave_news_search(
-                    query=arguments["query"],
-                    count=arguments.get("count"),
-                    offset=arguments.get("offset"),
-                    country=arguments.get("country"),
-                    search_lang=arguments.get("search_lang"),
-                    safesearch=arguments.get("safesearch"),
-                    freshness=arguments.get("freshness")
-                )
-
-                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-            except Exception as e:
-                logger.exception(f"Error in brave_news_search: {e}")
-                return [types.TextContent(type="text", text=f"Error: {str(e)}")]
-
-        elif name == "brave_video_search":
-            try:
-                result = brave_video_search(
-                    query=arguments["query"],
-                    count=arguments.get("count"),
-                    offset=arguments.get("offset"),
-                    country=arguments.get("country"),
-                    search_lang=arguments.get("search_lang"),
-                    safesearch=arguments.get("safesearch"),
-                    freshness=arguments.get("freshness")
-                )
-
-                return [types.TextContent(type="text", text=json.dumps(result, indent=2))]
-            except Exception as e:
-                logger.exception(f"Error in brave_video_search: {e}")
-                return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+        keys = _TOOL_KEYS.get(name)
+        if keys is None:
+            return _err(f"Unknown tool: {name}")
+        if "query" not in arguments:
+            return _err("query is required")
+
+        try:
+            # tools loads its search module on first access (PEP 562)
+            func = getattr(tools, name)
+            kwargs = {k: arguments[k] for k in keys if k in arguments}
+
+            async def run():
+                async with _CALL_SEM:
+                    return await func(query=arguments["query"], raw=True, **kwargs)
+
+            # The deadline covers queueing and the Brave round trip; expiring
+            # cancels this call and releases its _CALL_SEM slot. The upstream
+            # request is cancelled too unless another caller shares it.
+            result = await asyncio.wait_for(run(), MCP_REQUEST_TIMEOUT)
+            # Successful results arrive as Brave's compact JSON body; forward
+            # it as-is instead of parsing and re-serializing it.
+            text = result.decode() if isinstance(result, bytes) else _dumps(result)
+            return [types.TextContent(type="text", text=text)]
+        except asyncio.TimeoutError:
+            logger.warning("%s timed out after %ss", name, MCP_REQUEST_TIMEOUT)
+            return _err("timed out")
+        except Exception as e:
+            logger.exception("Error in %s: %s", name, e)
+            return _err(str(e))
 
     #-------------------------------------------------------------------------
 
+    # Initialization options are static once the handlers are registered
+    init_options = app.create_initialization_options()
+
     # Set up SSE transport
     sse = SseServerTransport("/messages/")
 
     async def handle_sse(request):
-        logger.info("Handling SSE connection")
+        logger.debug("Handling SSE connection")
 
         # Extract auth token from headers (allow None - will be handled at tool level)
         auth_token = request.headers.get('x-auth-token')
@@ -317,9 +338,7 @@ def main(
             async with sse.connect_sse(
                     request.scope, request.receive, request._send
             ) as streams:
-                await app.run(
-                    streams[0], streams[1], app.create_initialization_options()
-                )
+                await app.run(streams[0], streams[1], init_options)
         finally:
             auth_token_context.reset(token)
 
@@ -336,11 +355,12 @@ def main(
     async def handle_streamable_http(
             scope: Scope, receive: Receive, send: Send
     ) -> None:
-        logger.info("Handling StreamableHTTP request")
+        logger.debug("Handling StreamableHTTP request")
 
         # Extract auth token from headers (allow None - will be handled at tool level)
-        headers = dict(scope.get("headers", []))
-        auth_token = headers.get(b'x-auth-token')
+        auth_token = next(
+            (v for k, v in scope.get("headers", ()) if k == b'x-auth-token'), None
+        )
         if auth_token:
             auth_token = auth_token.decode('utf-8')
 
@@ -351,6 +371,16 @@ def main(
         finally:
             auth_token_context.reset(token)
 
+    # Only JSON replies are gzipped. Every other response on these routes is
+    # a server-sent event stream, which the compressor would hold back.
+    gzip_streamable_http = GZipMiddleware(handle_streamable_http, minimum_size=1024)
+
+    async def handle_mcp(scope: Scope, receive: Receive, send: Send) -> None:
+        if json_response and scope["method"] == "POST":
+            await gzip_streamable_http(scope, receive, send)
+        else:
+            await handle_streamable_http(scope, receive, send)
+
     @contextlib.asynccontextmanager
     async def lifespan(app: Starlette) -> AsyncIterator[None]:
         """Context manager for session manager."""
@@ -360,6 +390,7 @@ def main(
                 yield
             finally:
                 logger.info("Application shutting down...")
+                await close_brave_http()
 
     # Create an ASGI application with routes for both transports
     starlette_app = Starlette(
@@ -370,18 +401,29 @@ def main(
             Mount("/messages/", app=sse.handle_post_message),
 
             # StreamableHTTP route
-            Mount("/mcp", app=handle_streamable_http),
+            Mount("/mcp", app=handle_mcp),
         ],
         lifespan=lifespan,
     )
 
-    logger.info(f"Server starting on port {port} with dual transports:")
-    logger.info(f"  - SSE endpoint: http://localhost:{port}/sse")
-    logger.info(f"  - StreamableHTTP endpoint: http://localhost:{port}/mcp")
+    logger.info("Server starting on port %s with dual transports:", port)
+    scheme = "https" if ssl_certfile else "http"
+    logger.info("  - SSE endpoint: %s://localhost:%s/sse", scheme, port)
+    logger.info("  - StreamableHTTP endpoint: %s://localhost:%s/mcp", scheme, port)
 
     import uvicorn
 
-    uvicorn.run(starlette_app, host="0.0.0.0", port=port)
+    # "auto" picks uvloop and httptools when they are installed (see
+    # requirements.txt) and falls back to asyncio/h11 otherwise, e.g. on Windows.
+    uvicorn.run(
+        starlette_app,
+        host="0.0.0.0",
+        port=port,
+        loop="auto",
+        http="auto",
+        ssl_keyfile=ssl_keyfile,
+        ssl_certfile=ssl_certfile,
+    )
 
     return 0
 
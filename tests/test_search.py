@@ -0,0 +1,225 @@
+import asyncio
+import unittest
+from unittest import mock
+
+import httpx
+import mcp.types as types
+
+import server
+import tools.base as base
+from tools import auth_token_context, search
+
+_BODY = {"web": {"results": [{"title": "t"}]}}
+
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Concurrent identical searches share one upstream request.
+    """
+
+    async def asyncSetUp(self):
+        self.calls = 0
+        self.cancelled = False
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+        async def handler(request):
+            self.calls += 1
+            self.started.set()
+            try:
+                await self.release.wait()
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+            return httpx.Response(200, json={"web": {"results": [{"title": "t"}]}})
+
+        search.clear_brave_cache()
+        base._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.token = auth_token_context.set("test-token")
+
+    async def asyncTearDown(self):
+        auth_token_context.reset(self.token)
+        await base.close_brave_http()
+        search.clear_brave_cache()
+
+    async def test_concurrent_calls_make_one_request(self):
+        tasks = [asyncio.ensure_future(search.brave_web_search("q")) for _ in range(5)]
+        await self.started.wait()
+        self.release.set()
+        results = await asyncio.gather(*tasks)
+
+        self.assertEqual(self.calls, 1)
+        for result in results:
+            self.assertEqual(result, {"web": {"results": [{"title": "t"}]}})
+        self.assertEqual(search._in_flight, {})
+
+    async def test_cancelled_leader_does_not_fail_followers(self):
+        leader = asyncio.ensure_future(search.brave_web_search("q"))
+        await self.started.wait()
+        followers = [asyncio.ensure_future(search.brave_web_search("q")) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+        self.release.set()
+        results = await asyncio.gather(*followers)
+
+        self.assertEqual(self.calls, 1)
+        for result in results:
+            self.assertEqual(result, {"web": {"results": [{"title": "t"}]}})
+
+    async def test_last_waiter_leaving_cancels_the_request(self):
+        slots = search._request_sem._value
+        caller = asyncio.ensure_future(search.brave_web_search("q"))
+        await self.started.wait()
+
+        caller.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+
+        self.assertTrue(self.cancelled)
+        self.assertEqual(search._request_sem._value, slots)
+        self.assertEqual(search._in_flight, {})
+        self.assertEqual(search._cache, {})
+
+        # A later identical call starts a fresh request
+        self.release.set()
+        result = await search.brave_web_search("q")
+        self.assertEqual(result, {"web": {"results": [{"title": "t"}]}})
+        self.assertEqual(self.calls, 2)
+
+
+class SearchRequestTest(unittest.IsolatedAsyncioTestCase):
+    """
+    Query encoding, validation, caching, retries and the tool deadline.
+    """
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.cancelled = False
+
+        async def respond(request):
+            return httpx.Response(200, json=_BODY)
+
+        self.respond = respond
+
+        async def handler(request):
+            self.requests.append(request)
+            return await self.respond(request)
+
+        search.clear_brave_cache()
+        base._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        self.token = auth_token_context.set("test-token")
+
+    async def asyncTearDown(self):
+        auth_token_context.reset(self.token)
+        await base.close_brave_http()
+        search.clear_brave_cache()
+
+    async def hang(self, request):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+    async def test_unset_params_are_not_sent(self):
+        await search.brave_video_search("v", safesearch=None)
+        await search.brave_video_search("w")
+        await search._brave_request("web", {"q": "x", "count": 5, "offset": None})
+
+        params = [dict(request.url.params) for request in self.requests]
+        self.assertEqual(params[0], {"q": "v", "count": "5"})
+        self.assertEqual(params[1], {"q": "w", "count": "5", "safesearch": "off"})
+        self.assertEqual(params[2], {"q": "x", "count": "5"})
+
+    async def test_per_page_must_fit_the_endpoint(self):
+        for per_page in (0, 21):
+            result = await search.brave_paginated_search("q", per_page=per_page)
+            self.assertEqual(result, {"error": "per_page must be between 1 and 20"})
+        self.assertEqual(self.requests, [])
+
+        await search.brave_paginated_search("q", pages=1, per_page=50, endpoint="news")
+        self.assertEqual(self.requests[0].url.params["count"], "50")
+
+    async def test_error_bodies_are_not_cached(self):
+        async def respond(request):
+            if request.url.params["q"] == "status":
+                return httpx.Response(422, json={"type": "ErrorResponse"})
+            return httpx.Response(200, json={"error": "quota exceeded"})
+
+        self.respond = respond
+        for query in ("body", "status"):
+            for raw in (True, False):
+                result = await search.brave_web_search(query, raw=raw)
+                self.assertIn("error", result)
+
+        self.assertEqual(len(self.requests), 4)
+        self.assertEqual(search._cache, {})
+
+    async def test_raw_and_parsed_callers_share_one_entry(self):
+        raw = await search.brave_web_search("q", raw=True)
+        parsed = await search.brave_web_search("q")
+        projected = await search.brave_web_search("q", fields=("web.results.title",))
+
+        self.assertIsInstance(raw, bytes)
+        self.assertEqual(parsed, _BODY)
+        self.assertEqual(projected, _BODY)
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(len(search._cache), 1)
+
+    async def test_connect_errors_are_retried_in_one_layer(self):
+        async def respond(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        self.respond = respond
+        with mock.patch.object(search, "_backoff", return_value=0):
+            result = await search.brave_web_search("q")
+
+        self.assertIn("error", result)
+        self.assertEqual(len(self.requests), search._MAX_ATTEMPTS)
+
+        # The real client's transport must not add its own connect retries
+        await base.close_brave_http()
+        self.assertEqual(base.get_brave_http()._transport._pool._retries, 0)
+
+    async def test_tool_deadline_cancels_the_search(self):
+        self.respond = self.hang
+        call_tool = _call_tool_handler()
+        slots = search._request_sem._value
+        request = types.CallToolRequest(
+            method="tools/call",
+            params=types.CallToolRequestParams(name="brave_web_search", arguments={"query": "q"}),
+        )
+
+        with mock.patch.object(server, "MCP_REQUEST_TIMEOUT", 0.05):
+            result = await call_tool(request)
+        await asyncio.sleep(0)
+
+        self.assertEqual(result.root.content[0].text, "Error: timed out")
+        self.assertTrue(self.cancelled)
+        self.assertEqual(search._request_sem._value, slots)
+        self.assertEqual(search._in_flight, {})
+        self.assertEqual(search._cache, {})
+
+
+def _call_tool_handler():
+    """
+    Build the server without starting uvicorn and return its tools/call handler.
+    """
+    apps = []
+
+    class CapturingServer(server.Server):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            apps.append(self)
+
+    with mock.patch.object(server, "Server", CapturingServer), mock.patch("uvicorn.run"):
+        server.main.main(["--log-level", "WARNING"], standalone_mode=False)
+    return apps[0].request_handlers[types.CallToolRequest]
+
+
+if __name__ == "__main__":
+    unittest.main()
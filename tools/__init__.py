@@ -1,18 +1,37 @@
-from .base import (
-auth_token_context
-)
+import importlib
 
-from .search import (
-brave_web_search,
-brave_image_search,
-brave_news_search,
-brave_video_search
+from .base import (
+auth_token_context,
+close_brave_http
 )
 
-__all__ = [
+__all__ = (
     "auth_token_context",
+    "close_brave_http",
     "brave_web_search",
     "brave_image_search",
     "brave_news_search",
-    "brave_video_search"
-]
+    "brave_video_search",
+    "brave_paginated_search",
+    "brave_multisearch",
+    "clear_brave_cache"
+)
+
+# Search functions are loaded from .search on first access (PEP 562)
+_LAZY = {
+    "brave_web_search": ".search",
+    "brave_image_search": ".search",
+    "brave_news_search": ".search",
+    "brave_video_search": ".search",
+    "brave_paginated_search": ".search",
+    "brave_multisearch": ".search",
+    "clear_brave_cache": ".search",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,7 +1,10 @@
+import importlib.util
 import logging
 import os
 from contextvars import ContextVar
 from typing import Optional
+
+import httpx
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -9,17 +12,31 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
-auth_token_context: ContextVar[str] = ContextVar('auth_token')
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1.
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+auth_token_context: ContextVar[str] = ContextVar('auth_token', default="")
+
+# Read once at import; the environment fallback does not change per request.
+_ENV_TOKEN = os.getenv("BRAVE_SEARCH_API_KEY", "")
+
+# DNS is resolved only when a new connection is opened, so how long idle
+# connections are kept alive also bounds how often api.search.brave.com is
+# looked up.
+BRAVE_KEEPALIVE_EXPIRY = float(os.getenv("BRAVE_KEEPALIVE_EXPIRY", "300"))
+
+_BASE_HEADERS = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip",
+}
+
+_http_client: Optional[httpx.AsyncClient] = None
 
 def get_auth_token() -> str:
-    try:
-        token = auth_token_context.get()
-        return token
-    except LookupError:
-        token = os.getenv("BRAVE_SEARCH_API_KEY")
-        if not token:
-            raise RuntimeError("Authentication token not found in context or environment")
-        return token
+    token = auth_token_context.get() or _ENV_TOKEN
+    if not token:
+        raise RuntimeError("Authentication token not found in context or environment")
+    return token
 
 def get_brave_client() -> Optional[dict]:
     """
@@ -30,5 +47,41 @@ def get_brave_client() -> Optional[dict]:
         client = auth_token
         return client
     except RuntimeError as e:
-        logger.warning(f"Failed to get auth token: {e}")
-        return None
\ No newline at end of file
+        logger.warning("Failed to get auth token: %s", e)
+        return None
+
+
+def get_brave_http() -> httpx.AsyncClient:
+    """
+    Return the shared async HTTP client, creating it on first use.
+
+    Connections to the Brave API are kept alive and, when h2 is installed,
+    multiplexed over HTTP/2. Retries are left to the search layer, which
+    backs off between attempts.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        transport = httpx.AsyncHTTPTransport(
+            http2=_HTTP2,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=BRAVE_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _http_client = httpx.AsyncClient(
+            transport=transport,
+            headers=_BASE_HEADERS,
+            timeout=httpx.Timeout(10.0, connect=3.05),
+        )
+    return _http_client
+
+
+async def close_brave_http() -> None:
+    """
+    Close the shared async HTTP client if it has been created.
+    """
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
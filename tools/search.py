@@ -1,10 +1,280 @@
-import requests
-from .base import get_brave_client
+from .base import get_brave_client, get_brave_http
+import asyncio
+import inspect
 import logging
+import os
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+import httpx
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Parse response bytes directly; orjson is much faster when available
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
+
+# Brave API endpoints and the optional query params each search forwards
+_API_BASE = "https://api.search.brave.com/res/v1"
+_ENDPOINTS = {
+    # kind: (url, label for log and error messages)
+    "web": (f"{_API_BASE}/web/search", "Brave search"),
+    "images": (f"{_API_BASE}/images/search", "Brave image search"),
+    "news": (f"{_API_BASE}/news/search", "Brave news search"),
+    "videos": (f"{_API_BASE}/videos/search", "Brave video search"),
+}
+_WEB_PARAM_NAMES = ("country", "search_lang", "offset", "safesearch")
+_IMAGE_PARAM_NAMES = ("search_lang", "country", "safesearch")
+_NEWS_PARAM_NAMES = ("search_lang", "country", "safesearch", "offset", "freshness")
+_VIDEO_PARAM_NAMES = ("search_lang", "country", "safesearch", "offset", "freshness")
+
+# Accepted safesearch values per endpoint; image search has no 'moderate'.
+_SAFESEARCH = frozenset({"off", "moderate", "strict"})
+_IMAGE_SAFESEARCH = frozenset({"off", "strict"})
+
+# Bounds concurrent outbound Brave requests to stay within the plan's rate limit
+BRAVE_MAX_CONCURRENCY = int(os.getenv("BRAVE_MAX_CONCURRENCY", "20"))
+_request_sem = asyncio.Semaphore(BRAVE_MAX_CONCURRENCY)
+
+# Transient failures (connection errors, timeouts, 429/5xx) are retried
+_MAX_ATTEMPTS = 3
+_MAX_RETRY_AFTER = 5.0
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# In-memory LRU cache of successful responses as (body bytes, parsed dict),
+# keyed on endpoint, params and token
+BRAVE_CACHE_TTL = float(os.getenv("BRAVE_CACHE_TTL", "300"))
+BRAVE_CACHE_MAXSIZE = int(os.getenv("BRAVE_CACHE_MAXSIZE", "1024"))
+
+_cache: OrderedDict = OrderedDict()
+
+# [fetch task, waiter count] for requests currently in flight, keyed like the cache
+_in_flight: dict = {}
+
+
+def _cache_get(key: tuple):
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    ts, data = entry
+    if time.monotonic() - ts >= BRAVE_CACHE_TTL:
+        del _cache[key]
+        return None
+    _cache.move_to_end(key)
+    return data
+
+
+def _cache_put(key: tuple, response: tuple) -> None:
+    if BRAVE_CACHE_TTL <= 0 or BRAVE_CACHE_MAXSIZE <= 0:
+        return
+    _cache[key] = (time.monotonic(), response)
+    _cache.move_to_end(key)
+    while len(_cache) > BRAVE_CACHE_MAXSIZE:
+        _cache.popitem(last=False)
+
+
+def _forget_in_flight(key: tuple, entry: list) -> None:
+    if _in_flight.get(key) is entry:
+        del _in_flight[key]
+
+
+def clear_brave_cache() -> None:
+    """
+    Drop all cached Brave responses.
+    """
+    _cache.clear()
+
+
+def _require_token() -> tuple:
+    """
+    Return (token, None), or (None, error dict) when no token is available.
+    """
+    token = get_brave_client()
+    if not token:
+        logger.error("Could not get Brave subscription token")
+        return None, {"error": "Missing Brave subscription token"}
+    return token, None
+
+
+def _backoff(attempt: int) -> float:
+    return 0.3 * 2 ** attempt
+
+
+def _retry_after(response: httpx.Response):
+    """
+    Return the Retry-After delay in seconds (capped), or None if absent.
+    """
+    try:
+        return min(float(response.headers["Retry-After"]), _MAX_RETRY_AFTER)
+    except (KeyError, ValueError):
+        return None
+
+
+def _select_fields(data: dict, fields: tuple) -> dict:
+    """
+    Keep only the dotted paths in `fields`, e.g. 'web.results.url'.
+
+    Lists along a path are projected element-wise.
+    """
+    tree = {}
+    for field in fields:
+        node = tree
+        for part in field.split("."):
+            node = node.setdefault(part, {})
+
+    def project(value, node):
+        if not node:
+            return value
+        if isinstance(value, list):
+            return [project(item, node) for item in value]
+        if isinstance(value, dict):
+            return {k: project(value[k], sub) for k, sub in node.items() if k in value}
+        return value
+
+    return project(data, tree)
+
+
+async def _fetch(
+    key: tuple,
+    url: str,
+    label: str,
+    qs: str,
+    token: str,
+    query: str
+) -> dict | tuple:
+    """
+    Request `url?qs` with retries and cache a successful response under `key`.
+
+    Returns (body bytes, parsed dict), or a dict with an "error" key.
+    """
+    logger.info("Sending %s request: %s", label, query)
+    for attempt in range(_MAX_ATTEMPTS):
+        last_attempt = attempt == _MAX_ATTEMPTS - 1
+        try:
+            async with _request_sem:
+                response = await get_brave_http().get(
+                    f"{url}?{qs}", headers={"x-subscription-token": token}
+                )
+        except httpx.TimeoutException as e:
+            if last_attempt:
+                logger.error("%s timed out: %s", label, e)
+                return {"error": f"{label} timed out for query: {query}"}
+            logger.warning("%s timed out, retrying: %s", label, e)
+            await asyncio.sleep(_backoff(attempt))
+            continue
+        except httpx.TransportError as e:
+            if last_attempt:
+                logger.error("%s failed: %s", label, e)
+                return {"error": f"Could not complete {label} for query: {query}"}
+            logger.warning("%s failed, retrying: %s", label, e)
+            await asyncio.sleep(_backoff(attempt))
+            continue
+
+        if response.status_code in _RETRY_STATUSES and not last_attempt:
+            delay = _retry_after(response) or _backoff(attempt)
+            logger.warning("%s returned %s, retrying in %ss", label, response.status_code, delay)
+            await asyncio.sleep(delay)
+            continue
+        break
+
+    if response.is_error:
+        logger.error("%s returned HTTP %s", label, response.status_code)
+        return {
+            "error": f"{label} failed with HTTP {response.status_code} for query: {query}",
+            "status": response.status_code,
+        }
+
+    logger.info("Received %s response", label)
+    body = response.content
+    data = _loads(body)
+    if "error" in data:
+        return data
+    _cache_put(key, (body, data))
+    return body, data
+
+
+async def _brave_request(
+    kind: str,
+    params: dict,
+    fields: tuple = None,
+    raw: bool = False
+) -> dict | bytes:
+    """
+    Send a search request to a Brave endpoint and return the parsed JSON.
+
+    Args:
+        kind (str): Key into _ENDPOINTS, e.g. 'web'.
+        params (dict): Query params, including 'q'.
+        fields (tuple): Optional dotted paths to keep in the response.
+        raw (bool): Return the JSON body as bytes without parsing it. Ignored
+            when `fields` is set. Errors are still returned as dicts.
+    Returns:
+        dict | bytes: JSON response, or a dict with an "error" key.
+    """
+    token, error = _require_token()
+    if error:
+        return error
+
+    if fields:
+        data = await _send_request(kind, params, token)
+        return data if "error" in data else _select_fields(data, fields)
+    return await _send_request(kind, params, token, raw)
+
+
+async def _send_request(
+    kind: str,
+    params: dict,
+    token: str,
+    raw: bool = False
+) -> dict | bytes:
+    """
+    Send a search request with an already resolved subscription token.
+    """
+    url, label = _ENDPOINTS[kind]
+
+    query = params["q"]
+    # Encode once in a canonical order; the string is both cache key and URL.
+    # Unset (None) params are left out rather than sent as "None". The token
+    # is part of the key so one client's subscription never serves another
+    # client's queries.
+    qs = urlencode(sorted((k, v) for k, v in params.items() if v is not None))
+    key = (kind, qs, token)
+    result = _cache_get(key)
+    if result is not None:
+        logger.info("Returning cached %s response: %s", label, query)
+    else:
+        # Single-flight: concurrent identical requests share one upstream call.
+        # The fetch runs as its own task and every caller, the first included,
+        # awaits it through a shield, so cancelling one caller never fails the
+        # rest. Once the last caller is gone the fetch is cancelled as well,
+        # which frees its _request_sem slot.
+        entry = _in_flight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(_fetch(key, url, label, qs, token, query))
+            entry = _in_flight[key] = [task, 0]
+            task.add_done_callback(lambda t: _forget_in_flight(key, entry))
+        else:
+            task = entry[0]
+            logger.info("Joining in-flight %s request: %s", label, query)
+        entry[1] += 1
+        try:
+            result = await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if not entry[1] and not task.done():
+                task.cancel()
+                _forget_in_flight(key, entry)
+        if isinstance(result, dict):
+            return result
+
+    # One entry serves both raw and parsed callers without parsing again
+    body, data = result
+    return body if raw else data
+
 
 async def brave_web_search(
     query: str,
@@ -12,8 +282,10 @@ async def brave_web_search(
     offset: int = None,
     country: str = None,
     search_lang: str = None,
-    safesearch: str = None
-) -> dict:
+    safesearch: str = None,
+    fields: tuple = None,
+    raw: bool = False
+) -> dict | bytes:
     """
     Perform a Brave search query.
 
@@ -24,37 +296,21 @@ async def brave_web_search(
         country (str): 2-letter country code, e.g., 'US'.
         search_lang (str): Language code, e.g., 'en'.
         safesearch (str): 'off', 'moderate', or 'strict'.
+        fields (tuple): Optional dotted paths to keep, e.g. ('web.results.url',).
+        raw (bool): Return the JSON body as bytes instead of a dict.
     Returns:
-        dict: JSON response.
-    """
-    url = "https://api.search.brave.com/res/v1/web/search"
-    headers = {
-        "Accept": "application/json",
-        "Accept-Encoding": "gzip",
-        "x-subscription-token": get_brave_client()
-    }
-
-    params = {"q": query,
-              "count": count}
-
-    param_list = [
-        ("country", country),
-        ("search_lang", search_lang),
-        ("offset", offset),
-        ("safesearch", safesearch),
-    ]
-    for k, v in param_list:
-        if v is not None:
-            params[k] = v
-
-    logger.info(f"Sending Brave search request: {query}")
-    try:
-        response = requests.get(url, headers=headers, params=params)
-        logger.info("Received Brave search response")
-        return response.json()
-    except Exception as e:
-        logger.error(f"Brave search failed: {e}")
-        return {"error": f"Could not complete Brave search for query: {query}"}
+        dict | bytes: JSON response.
+    """
+    if safesearch is not None and safesearch not in _SAFESEARCH:
+        return {"error": f"Invalid safesearch value: {safesearch}"}
+
+    params = {"q": query, "count": count}
+
+    params.update(
+        (k, v) for k, v in zip(_WEB_PARAM_NAMES, (country, search_lang, offset, safesearch)) if v is not None
+    )
+
+    return await _brave_request("web", params, fields, raw)
 
 
 async def brave_image_search(
@@ -63,8 +319,10 @@ async def brave_image_search(
     offset: int = None,
     search_lang: str = None,
     country: str = None,
-    safesearch: str = None
-) -> dict:
+    safesearch: str = None,
+    fields: tuple = None,
+    raw: bool = False
+) -> dict | bytes:
     """
     Perform a Brave image search.
 
@@ -75,43 +333,23 @@ async def brave_image_search(
         search_lang (str): Language code, e.g., 'en'.
         country (str): 2-letter country code, e.g., 'US'.
         safesearch (str): 'off' or 'strict' (default).
+        fields (tuple): Optional dotted paths to keep, e.g. ('results.url',).
+        raw (bool): Return the JSON body as bytes instead of a dict.
     Returns:
-        dict: JSON response.
+        dict | bytes: JSON response.
     """
-    token = get_brave_client()
-    if not token:
-        logger.error("Could not get Brave subscription token")
-        return {"error": "Missing Brave subscription token"}
-
-    url = "https://api.search.brave.com/res/v1/images/search"
-    headers = {
-        "Accept": "application/json",
-        "Accept-Encoding": "gzip",
-        "x-subscription-token": token
-    }
+    if safesearch is not None and safesearch not in _IMAGE_SAFESEARCH:
+        return {"error": f"Invalid safesearch value: {safesearch}"}
 
     # Always include query
-    params = {"q": query,
-              'count': count}
+    params = {"q": query, "count": count}
 
     # Optional query params
-    param_list = [
-        ("search_lang", search_lang),
-        ("country", country),
-        ("safesearch", safesearch)
-    ]
-    for k, v in param_list:
-        if v is not None:
-            params[k] = v
-
-    logger.info(f"Sending Brave image search request: {query}")
-    try:
-        response = requests.get(url, headers=headers, params=params)
-        logger.info("Received Brave image search response")
-        return response.json()
-    except Exception as e:
-        logger.error(f"Brave image search failed: {e}")
-        return {"error": f"Could not complete Brave image search for query: {query}"}
+    params.update(
+        (k, v) for k, v in zip(_IMAGE_PARAM_NAMES, (search_lang, country, safesearch)) if v is not None
+    )
+
+    return await _brave_request("images", params, fields, raw)
 
 
 async def brave_news_search(
@@ -121,8 +359,10 @@ async def brave_news_search(
     country: str = None,
     search_lang: str = None,
     safesearch: str = None,
-    freshness: str = None
-) -> dict:
+    freshness: str = None,
+    fields: tuple = None,
+    raw: bool = False
+) -> dict | bytes:
     """
     Perform a Brave news search.
     Args:
@@ -133,42 +373,21 @@ async def brave_news_search(
         search_lang (str): Language code, e.g., 'en'.
         safesearch (str): 'off', 'moderate', or 'strict'.
         freshness (str): Filter by recency: 'pd' (24h), 'pw' (7d), 'pm' (31d), 'py' (year).
+        fields (tuple): Optional dotted paths to keep, e.g. ('results.url',).
+        raw (bool): Return the JSON body as bytes instead of a dict.
     Returns:
-        dict: JSON response.
+        dict | bytes: JSON response.
     """
-    token = get_brave_client()
-    if not token:
-        logger.error("Could not get Brave subscription token")
-        return {"error": "Missing Brave subscription token"}
-
-    url = "https://api.search.brave.com/res/v1/news/search"
-    headers = {
-        "Accept": "application/json",
-        "Accept-Encoding": "gzip",
-        "x-subscription-token": token
-    }
+    if safesearch is not None and safesearch not in _SAFESEARCH:
+        return {"error": f"Invalid safesearch value: {safesearch}"}
 
     params = {"q": query, "count": count}
 
-    param_list = [
-        ("search_lang", search_lang),
-        ("country", country),
-        ("safesearch", safesearch),
-        ("offset", offset),
-        ("freshness", freshness),
-    ]
-    for k, v in param_list:
-        if v is not None:
-            params[k] = v
-
-    logger.info(f"Sending Brave news search request: {query}")
-    try:
-        response = requests.get(url, headers=headers, params=params)
-        logger.info("Received Brave news search response")
-        return response.json()
-    except Exception as e:
-        logger.error(f"Brave news search failed: {e}")
-        return {"error": f"Could not complete Brave news search for query: {query}"}
+    params.update(
+        (k, v) for k, v in zip(_NEWS_PARAM_NAMES, (search_lang, country, safesearch, offset, freshness)) if v is not None
+    )
+
+    return await _brave_request("news", params, fields, raw)
 
 
 async def brave_video_search(
@@ -178,8 +397,10 @@ async def brave_video_search(
     country: str = None,
     search_lang: str = None,
     safesearch: str = "off",
-    freshness: str = None
-) -> dict:
+    freshness: str = None,
+    fields: tuple = None,
+    raw: bool = False
+) -> dict | bytes:
     """
     Perform a Brave video search.
 
@@ -191,39 +412,143 @@ async def brave_video_search(
         search_lang (str): Language code, e.g., 'en'.
         safesearch (str): 'off', 'moderate', or 'strict'.
         freshness (str): Filter by recency: 'pd' (24h), 'pw' (7d), 'pm' (31d), 'py' (year).
+        fields (tuple): Optional dotted paths to keep, e.g. ('results.url',).
+        raw (bool): Return the JSON body as bytes instead of a dict.
     Returns:
-        dict: JSON response.
+        dict | bytes: JSON response.
     """
 
-    token = get_brave_client()
-    if not token:
-        logger.error("Could not get Brave subscription token")
-        return {"error": "Missing Brave subscription token"}
-
-    url = "https://api.search.brave.com/res/v1/videos/search"
-    headers = {
-        "Accept": "application/json",
-        "Accept-Encoding": "gzip",
-        "x-subscription-token": token
-    }
-
-    params = {"q": query, "count": count, "safesearch": safesearch}
-
-    param_list = [
-        ("search_lang", search_lang),
-        ("country", country),
-        ("offset", offset),
-        ("freshness", freshness)
-    ]
-    for k, v in param_list:
-        if v is not None:
-            params[k] = v
-
-    logger.info(f"Sending Brave video search request: {query}")
-    try:
-        response = requests.get(url, headers=headers, params=params)
-        logger.info("Received Brave video search response")
-        return response.json()
-    except Exception as e:
-        logger.error(f"Brave video search failed: {e}")
-        return {"error": f"Could not complete Brave video search for query: {query}"}
+    if safesearch is not None and safesearch not in _SAFESEARCH:
+        return {"error": f"Invalid safesearch value: {safesearch}"}
+
+    params = {"q": query, "count": count}
+
+    params.update(
+        (k, v) for k, v in zip(_VIDEO_PARAM_NAMES, (search_lang, country, safesearch, offset, freshness)) if v is not None
+    )
+
+    return await _brave_request("videos", params, fields, raw)
+
+
+# Paginated endpoints: search function, path to the result list, max count
+_PAGINATED = {
+    "web": (brave_web_search, ("web", "results"), 20),
+    "news": (brave_news_search, ("results",), 50),
+    "videos": (brave_video_search, ("results",), 50),
+}
+
+
+def _extract_results(data: dict, path: tuple) -> list:
+    for key in path:
+        data = data.get(key) or {}
+    return data if isinstance(data, list) else []
+
+
+async def brave_paginated_search(
+    query: str,
+    pages: int = 2,
+    per_page: int = 5,
+    endpoint: str = "web",
+    **kwargs
+) -> dict:
+    """
+    Fetch several consecutive result pages for one query.
+
+    When pages * per_page fits within the endpoint's max count, all pages come
+    from a single request and are sliced locally; otherwise each page is
+    requested separately.
+
+    Args:
+        query (str): [Required] Search query.
+        pages (int): Number of pages to fetch (max 10).
+        per_page (int): Results per page (max 20 for web, 50 otherwise).
+        endpoint (str): 'web', 'news', or 'videos'.
+        **kwargs: Other arguments for the endpoint's search function.
+    Returns:
+        dict: {"pages": [[...], ...]} or an error dict.
+    """
+    if endpoint not in _PAGINATED:
+        return {"error": f"Unsupported endpoint for pagination: {endpoint}"}
+    if not 1 <= pages <= 10:
+        return {"error": "pages must be between 1 and 10"}
+    func, path, max_count = _PAGINATED[endpoint]
+    if not 1 <= per_page <= max_count:
+        return {"error": f"per_page must be between 1 and {max_count}"}
+
+    _, error = _require_token()
+    if error:
+        return error
+
+    kwargs.pop("count", None)
+    kwargs.pop("offset", None)
+    kwargs.pop("raw", None)
+
+    total = pages * per_page
+    if total <= max_count:
+        data = await func(query, count=total, offset=0, **kwargs)
+        if "error" in data:
+            return data
+        results = _extract_results(data, path)
+        return {"pages": [results[i:i + per_page] for i in range(0, total, per_page)]}
+
+    # Brave's offset counts pages of `count` results
+    responses = await asyncio.gather(
+        *(func(query, count=per_page, offset=i, **kwargs) for i in range(pages))
+    )
+    for data in responses:
+        if "error" in data:
+            return data
+    return {"pages": [_extract_results(data, path) for data in responses]}
+
+
+# Endpoints for brave_multisearch and the keyword arguments each one accepts
+_MULTISEARCH = {
+    "web": brave_web_search,
+    "images": brave_image_search,
+    "news": brave_news_search,
+    "videos": brave_video_search,
+}
+_MULTISEARCH_ARGS = {
+    name: frozenset(inspect.signature(func).parameters) - {"query"}
+    for name, func in _MULTISEARCH.items()
+}
+
+
+async def brave_multisearch(
+    query: str,
+    endpoints: tuple = ("web", "news", "images", "videos"),
+    **kwargs
+) -> dict:
+    """
+    Run the same query against several Brave endpoints concurrently.
+
+    Args:
+        query (str): [Required] Search query.
+        endpoints (tuple): Any of 'web', 'images', 'news', 'videos'.
+        **kwargs: Search arguments; each endpoint receives only those it accepts.
+    Returns:
+        dict: Mapping of endpoint name to its JSON response or error dict.
+    """
+    unknown = [e for e in endpoints if e not in _MULTISEARCH]
+    if unknown:
+        return {"error": f"Unsupported endpoints: {', '.join(unknown)}"}
+
+    _, error = _require_token()
+    if error:
+        return error
+
+    results = await asyncio.gather(
+        *(
+            _MULTISEARCH[e](query, **{k: v for k, v in kwargs.items() if k in _MULTISEARCH_ARGS[e]})
+            for e in endpoints
+        ),
+        return_exceptions=True,
+    )
+
+    output = {}
+    for endpoint, result in zip(endpoints, results):
+        if isinstance(result, Exception):
+            logger.error("Brave %s search failed: %s", endpoint, result)
+            result = {"error": f"Could not complete Brave {endpoint} search for query: {query}"}
+        output[endpoint] = result
+    return output